@@ -7,14 +7,34 @@
 ################################################################################
 
 #!/usr/bin/env python3
-import psutil
 import subprocess
+import sys
 import json
 import csv
+import re
+import bisect
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import math
+
+# Referência ligada uma vez: evita o lookup módulo.atributo a cada amostra
+# em laços de alta frequência.
+_now = datetime.now
 import sqlite3
 import os
+import asyncio
+import functools
+import time
+
+try:
+    import orjson  # encoder em Rust: 5-10x mais rápido que o json puro-Python
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # formato binário p/ consumo por outros scripts/coletores
+except ImportError:
+    msgpack = None
 
 # =========================
 # ANSI COLORS (btop-like)
@@ -30,6 +50,35 @@ class C:
     BOLD    = "\033[1m"
     RESET   = "\033[0m"
 
+# =========================
+# VIEW TEMPLATES
+# =========================
+# Os códigos ANSI são resolvidos uma única vez no import; em tempo de
+# execução cada seção vira um format_map com os valores da auditoria,
+# em vez de f-strings remontando os escapes a cada run.
+_ANSI = {k: v for k, v in vars(C).items() if not k.startswith("_")}
+
+def _tpl(text):
+    return text.format_map(_ANSI)
+
+_TPL_HEADER = _tpl("\n{BOLD}{CYAN}Linux Resource Audit{RESET}  {GRAY}{{timestamp}}{RESET}")
+_TPL_RISK_HEADER = _tpl("\n{BOLD}Risco:{RESET}")
+_TPL_RISK_ITEM = _tpl("  {{color}}● {{risk}}{RESET}")
+_TPL_MEM_HEADER = _tpl("\n{BOLD}Memória:{RESET}")
+_TPL_MEM_RAM = _tpl("  RAM: {{mem_used_gb}} / {{mem_total_gb}} GB ({{mem_color}}{{mem_used_pct}}%{RESET})")
+_TPL_MEM_SWAP = _tpl("  Swap: {{swap_used_pct}}% {{swap_color}}{{swap_status}}{RESET}")
+_TPL_MEM_RECO = _tpl("  {BLUE}→ RAM recomendada: {{ram_gb}} GB{RESET}")
+_TPL_DISK_HEADER = _tpl("\n{BOLD}Disco:{RESET}")
+_TPL_DISK_ITEM = _tpl(
+    "  {{mount:<5}} {{used_gb}} / {{total_gb}} GB ({{color}}{{used_pct}}%{RESET})\n"
+    "    {BLUE}→ recomendado: {{reco_gb}} GB{RESET}"
+)
+_TPL_LOGS_HEADER = _tpl("\n{BOLD}Logs (journald):{RESET}")
+_TPL_LOGS_ITEM = _tpl("  {GRAY}{{key}}{RESET} = {{value}}")
+_TPL_ANALYSIS_HEADER = _tpl("\n{BOLD}Análise:{RESET}")
+_TPL_ANALYSIS_ITEM = _tpl("  {GRAY}- {{line}}{RESET}")
+_TPL_FOOTER = _tpl("\n{GREEN}✔ Relatório salvo em audit_report.json{RESET}")
+
 # =========================
 # CONFIGURAÇÕES
 # =========================
@@ -41,50 +90,216 @@ THRESHOLDS = {
 
 OUTPUT_JSON = "audit_report.json"
 OUTPUT_CSV = "audit_report.csv"
+OUTPUT_MSGPACK = "audit_report.msgpack"
 
 
 DB_FILE = "audit_history.db"
 
+# Pontos de montagem auditados. Schema e INSERT do SQLite são gerados
+# daqui no import: acrescentar um mount não exige reescrever SQL, e o
+# texto constante do INSERT reaproveita o statement compilado do sqlite3.
+MOUNTS = ("/", "/var", "/home")
+
+_DISK_COLS = tuple(
+    f"disk_{m.strip('/').replace('/', '_') or 'root'}_pct" for m in MOUNTS
+)
+
+_CREATE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS audits (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        ram_used_pct REAL,
+        swap_used_pct REAL,
+        ram_total_gb REAL,
+        {", ".join(col + " REAL" for col in _DISK_COLS)},
+        risk_level TEXT
+    )
+"""
+
+_INSERT_SQL = (
+    "INSERT INTO audits (timestamp, ram_used_pct, swap_used_pct, "
+    f"ram_total_gb, {', '.join(_DISK_COLS)}, risk_level) "
+    f"VALUES ({', '.join('?' * (5 + len(_DISK_COLS)))})"
+)
+
 # =========================
 # EXTRACT
 # =========================
+@functools.lru_cache(maxsize=1)
+def _cgroup_limit_bytes():
+    # Dentro de um container, /proc/meminfo mostra a RAM do host; o limite
+    # real vem do cgroup. O valor só muda com restart do container, então
+    # cacheia-se a leitura para o resto do processo.
+    for path in ("/sys/fs/cgroup/memory.max",              # cgroup v2
+                 "/sys/fs/cgroup/memory/memory.limit_in_bytes"):  # v1
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value == "max":
+            return None
+        limit = int(value)
+        # cgroup v1 sem limite reporta um número gigante (~2^63)
+        if limit >= 1 << 60:
+            return None
+        return limit
+    return None
+
+
+def _cgroup_usage_bytes():
+    # Uso de memória do próprio cgroup — ao contrário do limite, muda a
+    # cada leitura, então não é cacheado.
+    for path in ("/sys/fs/cgroup/memory.current",              # cgroup v2
+                 "/sys/fs/cgroup/memory/memory.usage_in_bytes"):  # v1
+        try:
+            with open(path) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            continue
+    return None
+
+
 def get_memory_info():
-    mem = psutil.virtual_memory()
-    swap = psutil.swap_memory()
+    # Uma única leitura de /proc/meminfo no lugar de psutil.virtual_memory()
+    # + psutil.swap_memory(), que abrem e parseiam o mesmo arquivo duas vezes.
+    info = {}
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("MemTotal", "MemAvailable", "SwapTotal", "SwapFree"):
+                info[key] = int(rest.split()[0]) * 1024  # kB -> bytes
+                if len(info) == 4:
+                    break
+
+    mem_total = info["MemTotal"]
+    mem_used = mem_total - info["MemAvailable"]
+
+    # Em container, o limite do cgroup é o teto real de RAM — sem ele,
+    # ram_gb_recommended sairia dimensionado pela memória do host. O uso
+    # também precisa vir do cgroup: o MemTotal-MemAvailable do host
+    # estoura o limite em qualquer host razoavelmente ocupado.
+    cgroup_limit = _cgroup_limit_bytes()
+    if cgroup_limit is not None and cgroup_limit < mem_total:
+        mem_total = cgroup_limit
+        cgroup_usage = _cgroup_usage_bytes()
+        if cgroup_usage is not None:
+            mem_used = min(cgroup_usage, mem_total)
+        else:
+            mem_used = min(mem_used, mem_total)
+    swap_total = info["SwapTotal"]
+    swap_used = swap_total - info["SwapFree"]
+
     return {
-        "mem_total_gb": round(mem.total / 1e9, 2),
-        "mem_used_gb": round(mem.used / 1e9, 2),
-        "mem_used_pct": mem.percent,
-        "swap_total_gb": round(swap.total / 1e9, 2),
-        "swap_used_pct": swap.percent
+        "mem_total_gb": round(mem_total / 1e9, 2),
+        "mem_used_gb": round(mem_used / 1e9, 2),
+        "mem_used_pct": round(mem_used / mem_total * 100, 1),
+        "swap_total_gb": round(swap_total / 1e9, 2),
+        "swap_used_pct": round(swap_used / swap_total * 100, 1) if swap_total else 0.0
     }
 
-def get_disk_info(mounts=("/", "/var", "/home")):
+def get_disk_info(mounts=MOUNTS):
+    # os.statvfs direto no lugar de psutil.disk_usage: mesmo syscall,
+    # sem a camada Python do psutil (e sem o custo de importá-lo).
     disks = {}
     for mount in mounts:
         try:
-            usage = psutil.disk_usage(mount)
-            disks[mount] = {
-                "total_gb": round(usage.total / 1e9, 2),
-                "used_gb": round(usage.used / 1e9, 2),
-                "used_pct": usage.percent
-            }
+            st = os.statvfs(mount)
         except FileNotFoundError:
             disks[mount] = {"error": "mount not found"}
+            continue
+
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        avail = st.f_bavail * st.f_frsize
+        # percentual sobre o espaço visível ao usuário (used + avail),
+        # igual ao que o psutil e o df reportam
+        disks[mount] = {
+            "total_gb": round(total / 1e9, 2),
+            "used_gb": round(used / 1e9, 2),
+            "used_pct": round(used / (used + avail) * 100, 1) if used + avail else 0.0
+        }
     return disks
 
+LOG_PATTERN = r"(?i)oom|out of memory|allocation failure|enospc|no space left|memory pressure"
+_LOG_RE_B = re.compile(LOG_PATTERN.encode("ascii"))
+
 def get_critical_logs():
-    keywords = [
-        "oom", "out of memory", "allocation failure",
-        "enospc", "no space left", "memory pressure"
+    # Filtro no lado do journalctl (-p err + -g PCRE): só as linhas
+    # relevantes atravessam o pipe, em vez do ring de 7 dias inteiro.
+    cmd = [
+        "journalctl", "--since", "7 days ago", "-k",
+        "-p", "err", "-g", LOG_PATTERN,
+        "-o", "cat", "-n", "20", "--no-pager"
     ]
+    result = subprocess.run(cmd, capture_output=True)
+    # journalctl sai com rc=1 (stderr vazio) quando o -g simplesmente não
+    # casa nada — o caso normal em sistema saudável. Só stderr preenchido
+    # indica que a opção foi rejeitada (build sem PCRE2) e exige fallback.
+    if result.returncode in (0, 1) and not result.stderr:
+        return result.stdout.decode("utf-8", "replace").splitlines()[-20:]
+
+    # Fallback: journalctl compilado sem PCRE2 não aceita -g.
+    # Lê a saída linha a linha por um pipe e mantém só as 20 últimas
+    # correspondências em um deque — memória O(1) em vez de
+    # materializar o journal de 7 dias inteiro como string.
+    # O filtro roda sobre bytes crus; só as sobreviventes (<= 20 linhas)
+    # pagam o decode UTF-8, em vez do journal inteiro com text=True.
     cmd = ["journalctl", "--since", "7 days ago", "-k", "--no-pager"]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    lines = [
-        line for line in result.stdout.splitlines()
-        if any(k in line.lower() for k in keywords)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    tail = deque(maxlen=20)
+    for line in proc.stdout:
+        if _LOG_RE_B.search(line):
+            tail.append(line.decode("utf-8", "replace").rstrip("\n"))
+    proc.wait()
+    return list(tail)
+
+
+async def get_critical_logs_async():
+    # Variante assíncrona para quando o audit roda dentro de um event
+    # loop (ex.: exporter Prometheus): o subprocess.run bloqueante
+    # congelaria o loop inteiro durante a varredura do journal.
+    cmd = [
+        "journalctl", "--since", "7 days ago", "-k",
+        "-p", "err", "-g", LOG_PATTERN,
+        "-o", "cat", "-n", "20", "--no-pager"
     ]
-    return lines[-20:]
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    out, err = await proc.communicate()
+    # Mesmo critério da versão síncrona: rc=1 com stderr vazio é apenas
+    # "-g não casou nada"; só stderr preenchido indica -g rejeitado.
+    if proc.returncode in (0, 1) and not err:
+        return out.decode("utf-8", "replace").splitlines()[-20:]
+
+    # Mesmo fallback da versão síncrona, lendo o pipe sem bloquear.
+    cmd = ["journalctl", "--since", "7 days ago", "-k", "--no-pager"]
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    tail = deque(maxlen=20)
+    while True:
+        line = await proc.stdout.readline()
+        if not line:
+            break
+        if _LOG_RE_B.search(line):
+            tail.append(line.decode("utf-8", "replace").rstrip("\n"))
+    await proc.wait()
+    return list(tail)
+
+
+async def extract_async():
+    # Os três estágios de EXTRACT em paralelo dentro do event loop:
+    # memória/disco vão para threads, o journalctl usa o subprocess nativo.
+    return await asyncio.gather(
+        asyncio.to_thread(get_memory_info),
+        asyncio.to_thread(get_disk_info),
+        get_critical_logs_async()
+    )
 
 # =========================
 # TRANSFORM
@@ -104,15 +319,13 @@ def classify_risk(mem, disks):
 
     return alerts if alerts else ["OK"]
 
+# Tabela ordenada de cortes + tupla de cores: bisect resolve a faixa em
+# uma busca binária, sem a cadeia de if/elif por amostra.
+_PCT_CUTS = (70, 80, 90)
+_PCT_COLORS = (C.GREEN, C.YELLOW, C.ORANGE, C.RED)
+
 def color_by_pct(pct):
-    if pct >= 90:
-        return C.RED
-    elif pct >= 80:
-        return C.ORANGE
-    elif pct >= 70:
-        return C.YELLOW
-    else:
-        return C.GREEN
+    return _PCT_COLORS[bisect.bisect_right(_PCT_CUTS, pct)]
 
 def color_risk(label):
     if "CRITICAL" in label:
@@ -121,14 +334,21 @@ def color_risk(label):
 
 
 
+def _ceil_scaled(gb, num, den):
+    # ceil(gb * num/den) em aritmética inteira sobre centi-GB: evita o
+    # FP multiply + math.ceil e as surpresas de arredondamento perto
+    # de .5 num valor que já chegou arredondado a 2 casas.
+    cgb = round(gb * 100)
+    return -(-cgb * num // (den * 100))
+
 def recommend_resources(mem, disks):
     recommendations = {}
 
     # ---- RAM ----
     if mem["mem_used_pct"] >= 80:
-        ideal_ram = math.ceil(mem["mem_used_gb"] * 1.5)
+        ideal_ram = _ceil_scaled(mem["mem_used_gb"], 3, 2)   # x1.5
     else:
-        ideal_ram = math.ceil(mem["mem_total_gb"])
+        ideal_ram = _ceil_scaled(mem["mem_total_gb"], 1, 1)
 
     recommendations["ram_gb_recommended"] = ideal_ram
 
@@ -136,7 +356,7 @@ def recommend_resources(mem, disks):
     disk_reco = {}
     for mount, data in disks.items():
         if "used_gb" in data:
-            recommended_size = math.ceil(data["used_gb"] * 1.4)
+            recommended_size = _ceil_scaled(data["used_gb"], 7, 5)  # x1.4
             disk_reco[mount] = {
                 "current_total_gb": data["total_gb"],
                 "recommended_total_gb": recommended_size
@@ -178,26 +398,38 @@ def generate_analysis(risk, mem, disks):
     return analysis
 
 
-def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    cur = conn.cursor()
+class DB:
+    """Conexão única com o SQLite, reutilizada durante todo o processo.
+
+    Abrir/fechar uma conexão a cada auditoria custa um fsync por commit
+    (synchronous=FULL). Com uma conexão em cache + WAL, gravações em lote
+    viram um único commit.
+    """
+
+    _conn = None
+    _schema_ready = False
+
+    @classmethod
+    def connect(cls):
+        if cls._conn is None:
+            cls._conn = sqlite3.connect(DB_FILE)
+            cur = cls._conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.execute("PRAGMA temp_store=MEMORY")
+            cur.execute("PRAGMA mmap_size=134217728")  # 128 MiB: leituras via page cache, sem read()
+        # O CREATE TABLE IF NOT EXISTS só precisa rodar uma vez por
+        # processo; repeti-lo força parse de DDL e consulta ao
+        # sqlite_master a cada auditoria.
+        if not cls._schema_ready:
+            cls._conn.execute(_CREATE_SQL)
+            cls._conn.commit()
+            cls._schema_ready = True
+        return cls._conn
 
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS audits (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            ram_used_pct REAL,
-            swap_used_pct REAL,
-            ram_total_gb REAL,
-            disk_root_pct REAL,
-            disk_var_pct REAL,
-            disk_home_pct REAL,
-            risk_level TEXT
-        )
-    """)
 
-    conn.commit()
-    conn.close()
+def init_db():
+    DB.connect()
 
 
 
@@ -205,57 +437,63 @@ def init_db():
 # LOAD
 # =========================
 def save_json(report):
-    with open(OUTPUT_JSON, "w") as f:
-        json.dump(report, f, indent=4)
+    if orjson is not None:
+        with open(OUTPUT_JSON, "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUTPUT_JSON, "w") as f:
+            json.dump(report, f, indent=4)
+
+def save_msgpack(report):
+    # Saída binária opcional: ~3x menor e sem o ciclo float->texto->float
+    # quando o relatório é consumido por outro script, não por humanos.
+    if msgpack is None:
+        return
+    with open(OUTPUT_MSGPACK, "wb") as f:
+        f.write(msgpack.packb(report))
 
 def save_csv(report):
+    ts = report["timestamp"]
+
+    # Monta todas as linhas primeiro e grava com um único writerows(),
+    # em vez de um writerow() por métrica.
+    rows = [[ts, k, v] for k, v in report["memory"].items()]
+    rows += [
+        [ts, f"disk_used_pct:{mount}", data["used_pct"]]
+        for mount, data in report["disks"].items()
+        if "used_pct" in data
+    ]
+
     with open(OUTPUT_CSV, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["timestamp", "metric", "value"])
+        writer.writerows(rows)
 
-        mem = report["memory"]
-        for k, v in mem.items():
-            writer.writerow([report["timestamp"], k, v])
-
-        for mount, data in report["disks"].items():
-            if "used_pct" in data:
-                writer.writerow([
-                    report["timestamp"],
-                    f"disk_used_pct:{mount}",
-                    data["used_pct"]
-                ])
 
+def save_sqlite(reports):
+    # Aceita um relatório único ou uma lista (modo backfill em lote):
+    # todas as linhas entram em uma única transação via executemany.
+    if isinstance(reports, dict):
+        reports = [reports]
 
-def save_sqlite(report):
-    conn = sqlite3.connect(DB_FILE)
+    conn = DB.connect()
     cur = conn.cursor()
 
-    disks = report["disks"]
-
-    cur.execute("""
-        INSERT INTO audits (
-            timestamp,
-            ram_used_pct,
-            swap_used_pct,
-            ram_total_gb,
-            disk_root_pct,
-            disk_var_pct,
-            disk_home_pct,
-            risk_level
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        report["timestamp"],
-        report["memory"]["mem_used_pct"],
-        report["memory"]["swap_used_pct"],
-        report["memory"]["mem_total_gb"],
-        disks.get("/", {}).get("used_pct"),
-        disks.get("/var", {}).get("used_pct"),
-        disks.get("/home", {}).get("used_pct"),
-        ",".join(report["risk_level"])
-    ))
+    rows = []
+    for report in reports:
+        disks = report["disks"]
+        rows.append((
+            report["timestamp"],
+            report["memory"]["mem_used_pct"],
+            report["memory"]["swap_used_pct"],
+            report["memory"]["mem_total_gb"],
+            *(disks.get(m, {}).get("used_pct") for m in MOUNTS),
+            ",".join(report["risk_level"])
+        ))
+
+    cur.executemany(_INSERT_SQL, rows)
 
     conn.commit()
-    conn.close()
 
 
 
@@ -264,11 +502,18 @@ def save_sqlite(report):
 # =========================
 
 def run_audit():
-    timestamp = datetime.now().isoformat()
+    # timespec='seconds' corta os microssegundos, que só inflavam
+    # JSON/CSV/SQLite sem valor para auditoria diária
+    timestamp = _now().isoformat(timespec="seconds")
+
+    # Extrai em paralelo: o journalctl (fork + IO) domina o tempo total,
+    # então memória e disco saem "de graça" enquanto ele roda.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_mem = ex.submit(get_memory_info)
+        f_disk = ex.submit(get_disk_info)
+        f_logs = ex.submit(get_critical_logs)
+        memory, disks, logs = f_mem.result(), f_disk.result(), f_logs.result()
 
-    memory = get_memory_info()
-    disks = get_disk_info()
-    logs = get_critical_logs()
     risk = classify_risk(memory, disks)
     recommendations = recommend_resources(memory, disks)
     analysis = generate_analysis(risk, memory, disks)
@@ -291,55 +536,100 @@ def run_audit():
     # ===== LOAD (persistência) =====
     save_json(report)
     save_csv(report)
+    save_msgpack(report)
 
     # ===== VIEW (terminal) =====
-    print(f"\n{C.BOLD}{C.CYAN}Linux Resource Audit{C.RESET}  {C.GRAY}{timestamp}{C.RESET}")
-
-    print(f"\n{C.BOLD}Risco:{C.RESET}")
+    # Preenche os templates pré-renderizados e grava com um único
+    # write(): um flush/lock de stdout em vez de um por print().
+    buf = [_TPL_HEADER.format_map({"timestamp": timestamp}), _TPL_RISK_HEADER]
     for r in risk:
-        print(f"  {color_risk(r)}● {r}{C.RESET}")
-
-    print(f"\n{C.BOLD}Memória:{C.RESET}")
-    print(
-        f"  RAM: {memory['mem_used_gb']} / {memory['mem_total_gb']} GB "
-        f"({color_by_pct(memory['mem_used_pct'])}{memory['mem_used_pct']}%{C.RESET})"
-    )
-    print(
-        f"  Swap: {memory['swap_used_pct']}% "
-        f"{color_by_pct(memory['swap_used_pct'])}"
-        f"{'CRÍTICO' if memory['swap_used_pct'] >= 60 else 'OK'}{C.RESET}"
-    )
-
-    print(f"  {C.BLUE}→ RAM recomendada: {recommendations['ram_gb_recommended']} GB{C.RESET}")
-
-    print(f"\n{C.BOLD}Disco:{C.RESET}")
+        buf.append(_TPL_RISK_ITEM.format_map({"color": color_risk(r), "risk": r}))
+
+    buf.append(_TPL_MEM_HEADER)
+    buf.append(_TPL_MEM_RAM.format_map({
+        "mem_used_gb": memory["mem_used_gb"],
+        "mem_total_gb": memory["mem_total_gb"],
+        "mem_color": color_by_pct(memory["mem_used_pct"]),
+        "mem_used_pct": memory["mem_used_pct"]
+    }))
+    buf.append(_TPL_MEM_SWAP.format_map({
+        "swap_used_pct": memory["swap_used_pct"],
+        "swap_color": color_by_pct(memory["swap_used_pct"]),
+        "swap_status": "CRÍTICO" if memory["swap_used_pct"] >= 60 else "OK"
+    }))
+    buf.append(_TPL_MEM_RECO.format_map({"ram_gb": recommendations["ram_gb_recommended"]}))
+
+    buf.append(_TPL_DISK_HEADER)
     for mount, data in disks.items():
         if "used_pct" in data:
-            color = color_by_pct(data["used_pct"])
-            print(
-                f"  {mount:<5} "
-                f"{data['used_gb']} / {data['total_gb']} GB "
-                f"({color}{data['used_pct']}%{C.RESET})"
-            )
-
             reco = recommendations["disk_recommendations"][mount]
-            print(
-                f"    {C.BLUE}→ recomendado: {reco['recommended_total_gb']} GB{C.RESET}"
-            )
-
-    print(f"\n{C.BOLD}Logs (journald):{C.RESET}")
+            buf.append(_TPL_DISK_ITEM.format_map({
+                "mount": mount,
+                "used_gb": data["used_gb"],
+                "total_gb": data["total_gb"],
+                "color": color_by_pct(data["used_pct"]),
+                "used_pct": data["used_pct"],
+                "reco_gb": reco["recommended_total_gb"]
+            }))
+
+    buf.append(_TPL_LOGS_HEADER)
     for k, v in recommendations["journald_limits"].items():
-        print(f"  {C.GRAY}{k}{C.RESET} = {v}")
+        buf.append(_TPL_LOGS_ITEM.format_map({"key": k, "value": v}))
 
-    print(f"\n{C.BOLD}Análise:{C.RESET}")
+    buf.append(_TPL_ANALYSIS_HEADER)
     for line in analysis:
-        print(f"  {C.GRAY}- {line}{C.RESET}")
+        buf.append(_TPL_ANALYSIS_ITEM.format_map({"line": line}))
 
-    print(f"\n{C.GREEN}✔ Relatório salvo em audit_report.json{C.RESET}")
+    buf.append(_TPL_FOOTER)
+
+    sys.stdout.write("\n".join(buf) + "\n")
+
+
+# =========================
+# MODO SAMPLER
+# =========================
+
+def sample():
+    # Coleta reduzida para o laço de amostragem: só memória/disco + risco.
+    # Sem journalctl nem JSON/CSV por amostra — isso fica para o
+    # run_audit() completo.
+    memory = get_memory_info()
+    disks = get_disk_info()
+    return {
+        "timestamp": _now().isoformat(timespec="seconds"),
+        "risk_level": classify_risk(memory, disks),
+        "memory": memory,
+        "disks": disks
+    }
+
+def main_loop(interval_s=60.0, batch_size=10):
+    # Sampler de longa duração: um único processo em vez de um Python
+    # novo por amostra via cron (30-80 ms só de startup/import). A
+    # conexão/PRAGMAs/schema são pagos uma vez e o SQLite recebe as
+    # amostras em lotes de batch_size via executemany.
+    DB.connect()
+    pending = []
+    next_tick = time.monotonic()
+    try:
+        while True:
+            next_tick += interval_s
+            pending.append(sample())
+            if len(pending) >= batch_size:
+                save_sqlite(pending)
+                pending.clear()
+            # agenda pelo relógio monotônico: sem drift acumulado
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+    except KeyboardInterrupt:
+        if pending:
+            save_sqlite(pending)
 
 
 # =========================
 # ENTRYPOINT
 # =========================
 if __name__ == "__main__":
-    run_audit()
+    if len(sys.argv) > 1 and sys.argv[1] == "--loop":
+        interval = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+        main_loop(interval)
+    else:
+        run_audit()